@@ -1,6 +1,8 @@
+import importlib.util
+import sys
+
 import openseespy.opensees as ops
 import numpy as np
-import matplotlib.pyplot as plt
 
 # -------------------------
 # INICIALIZACIÓN
@@ -30,20 +32,17 @@ dz = Lz/nz
 # -------------------------
 print("Generando nodos...")
 
-nodeCounter = 1
-nodeCoord = {}
+# Coordenadas como arreglo (N, 3): la fila de cada nodo es nodeTag - 1
+# (orden x más rápido, luego y, luego z)
+zz, yy, xx = np.meshgrid(-np.arange(nz + 1) * dz,
+                         np.arange(ny + 1) * dy,
+                         np.arange(nx + 1) * dx, indexing='ij')
+nodeCoord = np.column_stack((xx.ravel(), yy.ravel(), zz.ravel()))
 
-for k in range(nz + 1):    # z direction
-    z = -k * dz           
-    for j in range(ny + 1):  # y direction
-        y = j * dy        
-        for i in range(nx + 1):  # x direction
-            x = i * dx    
-            ops.node(nodeCounter, x, y, z)
-            nodeCoord[nodeCounter] = (x, y, z)
-            nodeCounter += 1
+for nodeTag, (x, y, z) in enumerate(nodeCoord.tolist(), start=1):
+    ops.node(nodeTag, x, y, z)
 
-print(f"Total de nodos creados: {nodeCounter-1}")
+print(f"Total de nodos creados: {len(nodeCoord)}")
 
 # -------------------------
 # CONDICIONES DE BORDE
@@ -52,34 +51,20 @@ print("Aplicando condiciones de borde...")
 
 nodesPerLayer = (nx + 1) * (ny + 1)
 
-# Fijar base
-baseNodeTags = list(range(nodesPerLayer * nz + 1, nodesPerLayer * (nz + 1) + 1))
-for nodeTag in baseNodeTags:
-    ops.fix(nodeTag, 1, 1, 1)
-
-# Fijar bordes laterales con rodillos
-for k in range(nz + 1):
-    currentLayer = k * nodesPerLayer
-    
-    # Borde x = 0
-    for j in range(ny + 1):
-        nodeTag = currentLayer + j * (nx + 1) + 1
-        ops.fix(nodeTag, 1, 0, 0)
-    
-    # Borde x = Lx
-    for j in range(ny + 1):
-        nodeTag = currentLayer + j * (nx + 1) + (nx + 1)
-        ops.fix(nodeTag, 1, 0, 0)
-    
-    # Borde y = 0
-    for i in range(nx + 1):
-        nodeTag = currentLayer + i + 1
-        ops.fix(nodeTag, 0, 1, 0)
-    
-    # Borde y = Ly
-    for i in range(nx + 1):
-        nodeTag = currentLayer + ny * (nx + 1) + i + 1
-        ops.fix(nodeTag, 0, 1, 0)
+# Índices (k, j, i) de cada nodo, en el mismo orden que nodeCoord
+k_idx, j_idx, i_idx = np.indices((nz + 1, ny + 1, nx + 1)).reshape(3, -1)
+
+# Base fija en las tres direcciones; bordes laterales con rodillos
+# (x = 0 y x = Lx restringen ux, y = 0 e y = Ly restringen uy)
+base = k_idx == nz
+fixity = np.column_stack((base | (i_idx == 0) | (i_idx == nx),
+                          base | (j_idx == 0) | (j_idx == ny),
+                          base)).astype(int)
+
+# Una sola llamada a ops.fix por nodo con las restricciones combinadas
+constrained = np.flatnonzero(fixity.any(axis=1))
+for row, dofs in zip(constrained.tolist(), fixity[constrained].tolist()):
+    ops.fix(row + 1, *dofs)
 
 # -------------------------
 # MATERIAL
@@ -96,46 +81,40 @@ ops.nDMaterial('ElasticIsotropic', 1, E, nu, rho)
 # ELEMENTOS
 # -------------------------
 print("Generando elementos...")
-elementCounter = 1
-
-for k in range(nz):
-    for j in range(ny):
-        for i in range(nx):
-            node1 = 1 + i + j*(nx+1) + k*nodesPerLayer
-            node2 = node1 + 1
-            node3 = node2 + nx + 1
-            node4 = node3 - 1
-            node5 = node1 + nodesPerLayer
-            node6 = node2 + nodesPerLayer
-            node7 = node3 + nodesPerLayer
-            node8 = node4 + nodesPerLayer
-            
-            ops.element('stdBrick', elementCounter, node1, node2, node3, node4, 
-                       node5, node6, node7, node8, 1)
-            elementCounter += 1
-
-print(f"Total de elementos creados: {elementCounter-1}")
+
+# Nodo 1 de cada elemento (esquina de índices i, j, k), en orden x, y, z
+k_el, j_el, i_el = np.indices((nz, ny, nx)).reshape(3, -1)
+firstNode = 1 + i_el + j_el * (nx + 1) + k_el * nodesPerLayer
+
+# Desplazamientos de los 8 nodos del stdBrick respecto al nodo 1
+faceOffsets = np.array([0, 1, nx + 2, nx + 1])
+brickOffsets = np.concatenate((faceOffsets, faceOffsets + nodesPerLayer))
+connectivity = firstNode[:, None] + brickOffsets
+
+for elementTag, elementNodes in enumerate(connectivity.tolist(), start=1):
+    ops.element('stdBrick', elementTag, *elementNodes, 1)
+
+print(f"Total de elementos creados: {len(connectivity)}")
 
 # -------------------------
 # VISUALIZACIÓN
 # -------------------------
-try:
-    import vfo.vfo as vfo
-    
-    plt.figure(figsize=(12, 10))
-    vfo.plot_model(Model="3D")
-    ax = plt.gca(projection='3d')
-    ax.view_init(elev=30, azim=45)
-    ax.set_xlabel('X (m)')
-    ax.set_ylabel('Y (m)')
-    ax.set_zlabel('Z (m)')
-    plt.title('Malla 3D de Suelo (20m x 20m x 20m)')
-    ax.grid(True)
-    plt.savefig('soil_mesh_3d.png', dpi=300, bbox_inches='tight')
-    plt.show()
-    
-except ImportError:
+# find_spec solo consulta los metadatos del paquete, sin importarlo
+if importlib.util.find_spec('vfo') is None:
     print("Para visualización, instala vfo: pip install vfo")
+else:
+    import pyvista as pv
+    import vfo.vfo as vfo
+
+    # vfo dibuja el modelo con su propio Plotter de PyVista, por lo que no
+    # hace falta una figura de matplotlib. Sin terminal (CI, SSH, ejecución
+    # por lotes) se renderiza fuera de pantalla y se guarda la captura.
+    if sys.stdout.isatty():
+        vfo.plot_model(setview="3D")
+    else:
+        pv.OFF_SCREEN = True
+        vfo.plot_model(setview="3D", filename='soil_mesh_3d')
+        print("Vista del modelo guardada en 'soil_mesh_3d.png'")
 
 # -------------------------
 # INFORMACIÓN DE LA MALLA
@@ -150,7 +129,7 @@ print(f"Número total de elementos: {nx*ny*nz}")
 # Exportar coordenadas de nodos
 with open('node_coordinates.csv', 'w') as f:
     f.write('NodeTag,X,Y,Z\n')
-    for tag, coord in nodeCoord.items():
-        f.write(f'{tag},{coord[0]},{coord[1]},{coord[2]}\n')
+    for tag, (x, y, z) in enumerate(nodeCoord.tolist(), start=1):
+        f.write(f'{tag},{x},{y},{z}\n')
 
-print("\nCoordenadas de nodos exportadas a 'node_coordinates.csv'"
\ No newline at end of file
+print("\nCoordenadas de nodos exportadas a 'node_coordinates.csv'")